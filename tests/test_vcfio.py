@@ -31,6 +31,14 @@ def test_vcf_reader(get_created_vcf_tabix_files):
     assert(len(vcf_reader) == 17)
 
 
+def test_vcf_reader_regions(get_created_vcf_tabix_files):
+    """Get variants only from requested regions of mocked file stream.
+    """
+    vcf_file_path, tabix_file_path = get_created_vcf_tabix_files(mock_file_input())
+    vcf_reader = VCFReader(vcf_file_path, bams=[], is_fp=False, regions=["1:139000-139900", "1:240000-240030"])
+    assert(len(vcf_reader) == 7)
+
+
 def test_vcf_fetch_variant(get_created_vcf_tabix_files):
     """Get first variant from mocked VCF file stream.
     """
@@ -52,6 +60,17 @@ def test_vcf_load_fp(get_created_vcf_tabix_files):
             assert(v.zygosity[i] == VariantZygosity.NO_VARIANT)
 
 
+def test_vcf_iterate_variants(get_created_vcf_tabix_files):
+    """Iterate over variants and compare with indexed access.
+    """
+    vcf_file_path, tabix_file_path = get_created_vcf_tabix_files(mock_file_input())
+    vcf_reader = VCFReader(vcf=vcf_file_path, bams=[], is_fp=False)
+    variants = list(vcf_reader)
+    assert(len(variants) == len(vcf_reader))
+    for idx, variant in enumerate(variants):
+        assert(variant == vcf_reader[idx])
+
+
 def test_vcf_load_variant_from_multiple_files(get_created_vcf_tabix_files):
     """Get variants from multiple mocked VCF files.
     """
@@ -18,24 +18,6 @@
 from abc import ABC, abstractmethod
 
 
-class BaseReaderIterator:
-    """Iterator class for VCF reader."""
-
-    def __init__(self, reader):
-        """Initialize an iterator for a reader instance."""
-        assert(isinstance(reader, BaseReader))
-        self._reader = reader
-        self._index = 0
-
-    def __next__(self):
-        """Get next entry in reader instance."""
-        if self._index < len(self._reader):
-            result = self._reader[self._index]
-            self._index += 1
-            return result
-        raise StopIteration
-
-
 class BaseReader(ABC):
     """Base class for format reader."""
 
@@ -55,7 +37,8 @@ class BaseReader(ABC):
 
     def __iter__(self):
         """Iterate over class entries."""
-        return BaseReaderIterator(self)
+        for idx in range(len(self)):
+            yield self[idx]
 
     @abstractmethod
     def dataframe(self):
@@ -22,6 +22,7 @@ from functools import partial
 import math
 import multiprocessing as mp
 import re
+import sys
 
 import numpy as np
 import pandas as pd
@@ -40,7 +41,20 @@ def _df_row_to_variant(dataframe,
                        header_type, vcf, bams):
     # Convert row Series into dict to improve access performance.
     row = dataframe.iloc[idx].to_dict()
-
+    return _row_to_variant(row,
+                           format_vcf_key_counts,
+                           sample_names,
+                           filter_vcf_keys,
+                           info_vcf_key_counts,
+                           header_type, vcf, bams)
+
+
+def _row_to_variant(row,
+                    format_vcf_key_counts,
+                    sample_names,
+                    filter_vcf_keys,
+                    info_vcf_key_counts,
+                    header_type, vcf, bams):
     # Build sample data by iterating through FORMAT columns.
     samples = []
     zygosities = []
@@ -96,6 +110,47 @@ def _df_row_to_variant(dataframe,
     return variant
 
 
+# ALT values of gVCF reference blocks, which are skipped while parsing.
+_GVCF_ALTS = frozenset((".", "<NON_REF>"))
+
+# Zygosity enum members bound at module level for use in per-sample parsing, which
+# avoids an enum class attribute lookup for every genotype.
+_ZYG_NONE = VariantZygosity.NONE
+_ZYG_NO_VARIANT = VariantZygosity.NO_VARIANT
+_ZYG_HOMOZYGOUS = VariantZygosity.HOMOZYGOUS
+_ZYG_HETEROZYGOUS = VariantZygosity.HETEROZYGOUS
+
+# Zygosity of a diploid genotype whose haploid alt ids have been fixed up to -1
+# (other allele of a split multi allele), 0 (ref) or 1 (alt). Indexed by
+# (haploid 1 id + 1) * 3 + (haploid 2 id + 1). Any -1 makes the zygosity NONE.
+_ZYGOSITY_LUT = (_ZYG_NONE, _ZYG_NONE, _ZYG_NONE,
+                 _ZYG_NONE, _ZYG_NO_VARIANT, _ZYG_HETEROZYGOUS,
+                 _ZYG_NONE, _ZYG_HETEROZYGOUS, _ZYG_HOMOZYGOUS)
+
+
+def _fix_gt(gt_alt_id, loop_alt_id):
+    """Fix up genotype.
+
+    If gt alt id and loop alt id are the same, return 1 for alt.
+    If they're not 0, then it represents a split multi allele that's not handled in
+    the current loop.
+    If gt is 0, then return 0 as ref.
+
+    Args:
+        gt_alt_id : ID of alt allele
+        loop_alt_id : ID of current alt in loop
+
+    Returns:
+        Fixed up ID of alt.
+    """
+    if gt_alt_id == loop_alt_id:
+        return 1
+    elif gt_alt_id != 0:
+        return -1
+    else:
+        return 0
+
+
 class VCFReader(BaseReader):
     """Reader for VCF files."""
 
@@ -201,6 +256,23 @@ class VCFReader(BaseReader):
         """Return number of Varint objects."""
         return len(self._dataframe)
 
+    def __iter__(self):
+        """Iterate over Variant instances.
+
+        Rows are streamed from the dataframe in order, which avoids building
+        a pandas Series per row as done for random access through __getitem__.
+        """
+        columns = list(self._dataframe.columns)
+        for values in self._dataframe.itertuples(index=False, name=None):
+            yield _row_to_variant(dict(zip(columns, values)),
+                                  self._format_vcf_key_counts,
+                                  self._sample_names,
+                                  self._filter_vcf_keys,
+                                  self._info_vcf_key_counts,
+                                  self._header_type,
+                                  self._vcf,
+                                  self._bams)
+
     @property
     def dataframe(self):
         """Get variant list as a CPU pandas dataframe.
@@ -212,9 +284,9 @@ class VCFReader(BaseReader):
         3. end_pos - End position of variant (exclusive)
         4. ref - Reference base(s)
         5. alt - Alternate base(s)
-        6. variant_type - VariantType enum specifying SNP/INSERTION/DELETION as an int
+        6. variant_type - VariantType enum specifying SNP/INSERTION/DELETION as an int8
         7. quality - Quality of variant call
-        8. filter - VCF FILTER column [if requested]
+        8. filter - VCF FILTER column as booleans [if requested]
         9. info - VCF INFO column [if requested]
         10. format - VCF FORMAT column [if requested]. GT is converted to an int \
                 representation of VariantZygosity enum.
@@ -236,51 +308,25 @@ class VCFReader(BaseReader):
             extend_exception(RuntimeError, "VCF data frame should be available.")
         return self._dataframe
 
-    def _detect_variant_type(self, ref, alt):
-        """Get variant type enum.
+    def _detect_variant_types(self, refs, alts):
+        """Get variant type enums for a column of variants.
 
-        Given ref and alt alleles, determine type of variant.
+        Given ref and alt alleles, determine type of each variant. The
+        comparison is done on whole columns of allele lengths at once.
 
         Args:
-            ref : ref bases
-            alt : alt bases
+            refs : Series of ref bases
+            alts : Series of alt bases
 
         Returns:
-            VariantType enum
+            Array of VariantType enum values as int8
         """
-        if len(ref) == len(alt):
-            return VariantType.SNP
-        elif len(ref) < len(alt):
-            return VariantType.INSERTION
-        else:
-            return VariantType.DELETION
-
-    def _detect_zygosity(self, gt):
-        """Get variant zygosity as enum.
-
-        Given a diploid genotype type with genotype information per
-        haploid, determine the zygosity of the sample. If the variant is known
-        false positive, returns NO_VARIANT. If any of the alts are -1, then returns
-        NONE (e.g. in multi allele cases that were split).
-
-        Args:
-            gt : Diploid genotype in the format [haploid 1 alt num, haploid 2 alt num]
-
-        Returns:
-            Relevant VariantZygosity enum.
-        """
-        if self._is_fp:
-            return VariantZygosity.NO_VARIANT
-
-        if gt[0] == -1 or gt[1] == -1:
-            return VariantZygosity.NONE
-        elif gt[0] == gt[1]:
-            if gt[0] == 0:
-                return VariantZygosity.NO_VARIANT
-            else:
-                return VariantZygosity.HOMOZYGOUS
-        else:
-            return VariantZygosity.HETEROZYGOUS
+        ref_lens = refs.str.len().to_numpy()
+        alt_lens = alts.str.len().to_numpy()
+        variant_types = np.full(len(ref_lens), VariantType.DELETION, dtype=np.int8)
+        variant_types[ref_lens < alt_lens] = VariantType.INSERTION
+        variant_types[ref_lens == alt_lens] = VariantType.SNP
+        return variant_types
 
     def _get_normalized_count(self, header_number, num_alts, num_samples):
         """Calculate number of values for a VCF key based.
@@ -365,30 +411,47 @@ class VCFReader(BaseReader):
 
         samples = vcf.samples
 
+        # Bind frequently used attributes to locals to avoid lookups per record.
+        is_fp = self._is_fp
+
         # Iterate over all variants in variant list.
         for var_idx in range(num_variants):
             variant = variant_list[var_idx]
+            # cyvcf2 rebuilds genotype and FORMAT arrays from htslib on every access,
+            # so fetch them once per record instead of once per allele and sample.
+            genotypes = variant.genotypes if "GT" in self._format_vcf_keys and not is_fp else None
+            format_vals = {k: variant.format(k) for k in self._format_vcf_keys if k != "GT"}
+            # Standard fields are decoded by cyvcf2 on each attribute access, so read them
+            # once per record and share them across split alleles. FILTER is only decoded
+            # when filter columns were requested. Chromosome names repeat across most rows,
+            # so intern them to keep a single string object per chromosome.
+            chrom = sys.intern(variant.CHROM)
+            start = variant.start
+            end = variant.end
+            var_id = variant.ID
+            ref = variant.REF
+            quality = variant.QUAL
+            if self._filter_vcf_keys:
+                variant_filter = variant.FILTER
+                filter_set = set(("PASS" if variant_filter is None else variant_filter).split(";"))
             # Iterate over each allele in variant to split up multi alleles.
             alts = variant.ALT
             for alt_idx, alt in enumerate(alts):
                 # This parser currently doesn't support gVCF files completely, hence any
                 # gVCF entries are ignored.
-                if alt == "." or alt == "<NON_REF>":
+                if alt in _GVCF_ALTS:
                     continue
 
                 # Add standard DF entries for each variant.
-                df_dict["chrom"].append(variant.CHROM)
-                df_dict["start_pos"].append(variant.start)
-                df_dict["end_pos"].append(variant.end)
-                df_dict["id"].append(variant.ID)
-                df_dict["ref"].append(variant.REF)
+                df_dict["chrom"].append(chrom)
+                df_dict["start_pos"].append(start)
+                df_dict["end_pos"].append(end)
+                df_dict["id"].append(var_id)
+                df_dict["ref"].append(ref)
                 df_dict["alt"].append(alt)
-                df_dict["variant_type"].append(np.int32(self._detect_variant_type(variant.REF, alt)))
-                df_dict["quality"].append(variant.QUAL)
+                df_dict["quality"].append(quality)
 
                 # Process variant filter columns. If filter is present in entry, store True else False.
-                variant_filter = "PASS" if variant.FILTER is None else variant.FILTER
-                filter_set = set(variant_filter.split(";"))
                 for filter_col in self._filter_vcf_keys:
                     df_dict["FILTER_" + filter_col].append(filter_col in filter_set)
 
@@ -443,42 +506,23 @@ class VCFReader(BaseReader):
                 for format_col in self._format_vcf_keys:
                     for sample_idx, sample_name in enumerate(samples):
                         if format_col == "GT":
-                            def fix_gt(gt_alt_id, loop_alt_id):
-                                """Fix up genotype.
-
-                                If gt alt id and loop alt id are the same, return 1 for alt.
-                                If they're not 0, then it represents a split multi allele that's not handled in
-                                the current loop.
-                                If gt is 0, then return 0 as ref.
-
-                                Args:
-                                    gt_alt_id : ID of alt allele
-                                    loop_alt_id : ID of current alt in loop
-
-                                Returns:
-                                    Fixed up ID of alt.
-                                """
-                                if gt_alt_id == loop_alt_id:
-                                    return 1
-                                elif gt_alt_id != 0:
-                                    return -1
-                                else:
-                                    return 0
-                            # Handle GT column specially
-                            gt = variant.genotypes[sample_idx]
-                            # Fixup haplotype number based on multi allele split.
-                            alt_id = alt_idx + 1
-                            new_gt = [gt[0], gt[1]]
-                            new_gt[0] = fix_gt(gt[0], alt_id)
-                            new_gt[1] = fix_gt(gt[1], alt_id)
-                            if new_gt[0] == -1 or new_gt[1] == -1:
-                                new_gt[0] = new_gt[1] = -1
-                            df_dict["{}_GT".format(sample_name)].append(np.int32(self._detect_zygosity(new_gt)))
+                            # Handle GT column specially. Known false positives are always NO_VARIANT.
+                            if is_fp:
+                                zygosity = _ZYG_NO_VARIANT
+                            else:
+                                gt = genotypes[sample_idx]
+                                # Fixup haplotype number based on multi allele split and
+                                # look up the zygosity of the fixed up genotype.
+                                alt_id = alt_idx + 1
+                                zygosity = _ZYGOSITY_LUT[(_fix_gt(gt[0], alt_id) + 1) * 3 +
+                                                         (_fix_gt(gt[1], alt_id) + 1)]
+                            # Converted to an int32 array in bulk once the chunk is processed.
+                            df_dict["{}_GT".format(sample_name)].append(zygosity)
                         else:
                             # Get header type
                             header_number = self._header_number[format_col]
 
-                            val = variant.format(format_col)
+                            val = format_vals[format_col]
                             if val is not None:
                                 val = val[sample_idx]
                                 if isinstance(val, np.str_):
@@ -512,15 +556,25 @@ class VCFReader(BaseReader):
                                 for i in range(num_vals):
                                     df_dict[df_key + "-" + str(i)].append(val[i])
 
+        # FILTER columns only hold presence flags, so store them as booleans.
+        for filter_col in self._filter_vcf_keys:
+            df_key = "FILTER_" + filter_col
+            if df_key in df_dict:
+                df_dict[df_key] = np.array(df_dict[df_key], dtype=np.bool_)
+
         # Downcast all dataframe types to 32bit.
         for k in df_dict.keys():
-            if isinstance(df_dict[k][0], np.float32) or isinstance(df_dict[k][0], float):
+            if isinstance(df_dict[k][0], (np.float32, float)):
                 df_dict[k] = np.array(df_dict[k], dtype=np.float32)
-            elif isinstance(df_dict[k][0], np.int32) or isinstance(df_dict[k][0], int):
+            elif isinstance(df_dict[k][0], (np.int32, int)):
                 df_dict[k] = np.array(df_dict[k], dtype=np.int32)
         # Convert local dictionary of k/v to DataFrame.
         df = pd.DataFrame.from_dict(df_dict)
 
+        # Determine variant types for the whole chunk at once, next to the alleles.
+        if not df.empty:
+            df.insert(df.columns.get_loc("alt") + 1, "variant_type", self._detect_variant_types(df["ref"], df["alt"]))
+
         # Add custom tags to DataFrame
         for col, val in self._tags.items():
             df[col] = val
@@ -548,15 +602,18 @@ class VCFReader(BaseReader):
         # by current thread id across all regions
         global_variant_idx = 0
 
+        # Pre-allocate variant list to chunk size to prevent list extension. The list
+        # is reused for every chunk since _create_df only reads the filled entries.
+        variant_list = [None] * self._chunksize
+
+        # Open the VCF once and run each region as a tabix query against it.
+        vcf = cyvcf2.VCF(self._vcf)
+
         # Go through all regions assigned to reader
         for region in self._regions:
             # Go through variants and add to list
-            vcf = cyvcf2.VCF(self._vcf)
             generator = vcf(region) if region else vcf
 
-            # Pre-allocate variant list to chunk size to prevent list extension
-            variant_list = [None] * self._chunksize
-
             # Local idx is to track number of variants currently in the
             # variant list
             local_variant_idx = 0
@@ -569,11 +626,10 @@ class VCFReader(BaseReader):
                     local_variant_idx += 1
                     if local_variant_idx % self._chunksize == 0:
                         df_list.append(self._create_df(vcf, variant_list, local_variant_idx))
-                        variant_list = [None] * self._chunksize  # Reset list
                         local_variant_idx = 0
                 global_variant_idx += 1
 
-            if variant_list:
+            if local_variant_idx:
                 df_list.append(self._create_df(vcf, variant_list, local_variant_idx))
 
         return df_list
@@ -633,13 +689,17 @@ class VCFReader(BaseReader):
         for sample in vcf.samples:
             self._sample_names.append(sample)
 
-        # Create a pool of threads and distribute parsing to multiple threads.
-        pool = mp.Pool(self._num_threads)
+        # Create a pool of threads and distribute parsing to multiple threads. With a single
+        # thread, parse in process to avoid pool start up and pickling of the chunk DataFrames.
         df_lists = []
-        func = partial(self._parse_vcf_cyvcf)
-        for df in pool.imap(func, range(self._num_threads)):
-            df_lists.append(df)
-        pool.close()
+        if self._num_threads == 1:
+            df_lists.append(self._parse_vcf_cyvcf(0))
+        else:
+            pool = mp.Pool(self._num_threads)
+            func = partial(self._parse_vcf_cyvcf)
+            for df in pool.imap(func, range(self._num_threads)):
+                df_lists.append(df)
+            pool.close()
 
         df_list = [item for sublist in df_lists for item in sublist if len(item) > 0]
 
@@ -652,13 +712,55 @@ class VCFReader(BaseReader):
             self._dataframe["chrom"] = self._dataframe["chrom"].astype('object')
             self._dataframe["start_pos"] = self._dataframe["start_pos"].astype('int32')
             self._dataframe["end_pos"] = self._dataframe["end_pos"].astype('int32')
-            self._dataframe["variant_type"] = self._dataframe["variant_type"].astype('int32')
+            self._dataframe["variant_type"] = self._dataframe["variant_type"].astype('int8')
 
         # Sort dataframe by chromosome and start_position if requested
         if self._sort:
             self._dataframe.sort_values(["chrom", "start_pos"], axis='index', inplace=True, ignore_index=True)
 
 
+_ZYGOSITY_TO_GT = {
+    VariantZygosity.NONE: "./.",
+    VariantZygosity.NO_VARIANT: "0/0",
+    VariantZygosity.HOMOZYGOUS: "1/1",
+    VariantZygosity.HETEROZYGOUS: "0/1",
+}
+
+
+def _serialize_info_float(prefix, val):
+    return None if math.isnan(val) else prefix + format(val, ".4f")
+
+
+def _serialize_info_flag(key, val):
+    return key if val else None
+
+
+def _serialize_info_value(prefix, val):
+    return prefix + str(val)
+
+
+def _serialize_info_float_list(prefix, val):
+    return prefix + ",".join([format(x, ".4f") for x in val])
+
+
+def _serialize_info_list(prefix, val):
+    return prefix + ",".join([str(x) for x in val])
+
+
+# VCFWriter instance used by writer pool workers. It is handed to each worker once
+# through the pool initializer instead of being pickled with every task batch.
+_pool_writer = None
+
+
+def _init_pool_writer(writer):
+    global _pool_writer
+    _pool_writer = writer
+
+
+def _serialize_record_in_pool(idx):
+    return _pool_writer._get_serialized_vcf_record_for_variant(idx)
+
+
 class VCFWriter(BaseWriter):
     """Writer for VCF dataframe."""
 
@@ -702,6 +804,7 @@ class VCFWriter(BaseWriter):
 
         # Create and write header.
         self._categorize_df_headers(vcf_df)
+        self._info_serializers = self._create_info_serializers()
         with open(self._output_path, "w+") as file_writer:
             file_writer.write(self._generate_header())
             file_writer.write("\n")
@@ -716,11 +819,11 @@ class VCFWriter(BaseWriter):
         Returns:
             Python type (int, float, bool, str)
         """
-        if isinstance(val, np.int32) or isinstance(val, np.int64) or isinstance(val, int):
+        if isinstance(val, (np.int32, np.int64, int)):
             return int
-        elif isinstance(val, np.float32) or isinstance(val, np.float64) or isinstance(val, float):
+        elif isinstance(val, (np.float32, np.float64, float)):
             return float
-        elif isinstance(val, np.bool_) or isinstance(val, bool):
+        elif isinstance(val, (np.bool_, bool)):
             return bool
         else:
             return str
@@ -855,8 +958,56 @@ class VCFWriter(BaseWriter):
 
         return "\n".join(lines)
 
+    def _create_info_serializers(self):
+        """Build a serializer for each INFO key in the dataframe.
+
+        INFO value types and counts are fixed by the dataframe columns, so the
+        formatting branch for each key is resolved once here instead of being
+        re-determined for every record.
+
+        Returns:
+            Dictionary mapping INFO key to a function that converts a value into
+            its INFO column entry, or None if the entry is to be omitted.
+        """
+        serializers = dict()
+        for key, count in self._info_vcf_key_counts.items():
+            data_type = self._header_type[key]
+            prefix = key + "="
+            if count > 1:
+                if data_type is float:
+                    serializers[key] = partial(_serialize_info_float_list, prefix)
+                else:
+                    serializers[key] = partial(_serialize_info_list, prefix)
+            elif data_type is float:
+                serializers[key] = partial(_serialize_info_float, prefix)
+            elif data_type is bool:
+                serializers[key] = partial(_serialize_info_flag, key)
+            else:
+                serializers[key] = partial(_serialize_info_value, prefix)
+        return serializers
+
     @staticmethod
-    def _serialize_record_info(info_dict):
+    def _serialize_info_entry(k, v):
+        """Convert an INFO key and value of unknown type to an INFO entry.
+
+        Args:
+            k : INFO key.
+            v : INFO value.
+
+        Returns:
+            Formatted string, or None if entry is to be omitted.
+        """
+        if isinstance(v, (list, tuple)):
+            return "{}={}".format(
+                k, ','.join(map(lambda x: "{:.4f}".format(x) if isinstance(x, float) else str(x), v)))
+        elif not isinstance(v, str) and math.isnan(v):
+            return None
+        elif isinstance(v, bool):
+            return str(k) if v else None
+        else:
+            return "{}={:.4f}".format(k, v) if isinstance(v, float) else "{}={}".format(k, v)
+
+    def _serialize_record_info(self, info_dict):
         """Convert info dict to INFO column entry.
 
         Args:
@@ -865,20 +1016,15 @@ class VCFWriter(BaseWriter):
         Returns:
             Formatted string.
         """
+        serializers = self._info_serializers
         ret_list = list()
         for k, v in info_dict.items():
             if v is None:
                 continue
-            if type(v) is list:
-                ret_list.append("{}={}".format(
-                    k, ','.join(map(lambda x: "{:.4f}".format(x) if isinstance(x, float) else str(x), v))))
-            elif not isinstance(v, str) and math.isnan(v):
-                continue
-            elif isinstance(v, bool):
-                if v:
-                    ret_list.append(str(k))
-            else:
-                ret_list.append("{}={:.4f}".format(k, v) if isinstance(v, float) else "{}={}".format(k, v))
+            serializer = serializers.get(k)
+            entry = serializer(v) if serializer is not None else self._serialize_info_entry(k, v)
+            if entry is not None:
+                ret_list.append(entry)
         return ";".join(ret_list) if ret_list else "."
 
     @staticmethod
@@ -892,20 +1038,14 @@ class VCFWriter(BaseWriter):
         Returns:
             Formatted string.
         """
-        zyg_to_gt = {
-                VariantZygosity.NONE: "./.",
-                VariantZygosity.NO_VARIANT: "0/0",
-                VariantZygosity.HOMOZYGOUS: "1/1",
-                VariantZygosity.HETEROZYGOUS: "0/1",
-                }
         if gt_idx is not None:
-            sample[gt_idx] = zyg_to_gt[sample[gt_idx]]
+            sample[gt_idx] = _ZYGOSITY_TO_GT[sample[gt_idx]]
         ret_list = list()
         for field_value in sample:
-            if not field_value or field_value is None or (isinstance(field_value, float) and math.isnan(field_value)):
+            if not field_value or (isinstance(field_value, float) and math.isnan(field_value)):
                 ret_list.append(".")
-            elif type(field_value) is list:
-                ret_list.append(",".join(["{:.4f}".format(x) if isinstance(x, float) else str(x) for x in field_value]))
+            elif isinstance(field_value, (list, tuple)):
+                ret_list.append(",".join([format(x, ".4f") if isinstance(x, float) else str(x) for x in field_value]))
             else:
                 ret_list.append(str(field_value))
         return ":".join(ret_list) if ret_list else "."
@@ -922,7 +1062,7 @@ class VCFWriter(BaseWriter):
         """
         if var_filter is None:
             return "."
-        elif type(var_filter) is list:
+        elif isinstance(var_filter, (list, tuple)):
             if len(var_filter) == 0:
                 return "PASS"
             else:
@@ -976,8 +1116,8 @@ class VCFWriter(BaseWriter):
         self._vcf_df = vcf_df
         with open(self._output_path, "a") as file_writer:
             # Process variant entries in parallel fashion.
-            pool = mp.Pool(self._num_threads)
-            for line in pool.imap(self._get_serialized_vcf_record_for_variant,
+            pool = mp.Pool(self._num_threads, initializer=_init_pool_writer, initargs=(self,))
+            for line in pool.imap(_serialize_record_in_pool,
                                   range(len(self._vcf_df)),
                                   chunksize=50000):
                 file_writer.write('\t'.join(line) + '\n')